@@ -1 +1 @@
-from .configs import load_and_validate_configs, ConfigsValidationError, ConfigsParsingError, DEFAULT_CONFIGS, DEFAULT_CONFIGS_FILENAME
\ No newline at end of file
+from .configs import load_and_validate_configs, write_default_configs, ConfigsValidationError, ConfigsParsingError, DEFAULT_CONFIGS, DEFAULT_CONFIGS_FILENAME
\ No newline at end of file
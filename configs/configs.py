@@ -2,7 +2,13 @@ from constants import EXTERIOR, INFINITY
 from pydantic import validate_call
 import os
 import yaml
-from typing import Dict
+from typing import List
+
+# prefer the libyaml-backed loader and dumper, which are much faster than the pure-Python ones
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
 
 DEFAULT_CONFIGS_FILENAME: str = "configs.yaml"
 
@@ -50,6 +56,9 @@ DEFAULT_CONFIGS: dict = {
     ]
 }
 
+# sentinel for fields missing from the configuration file (a field can be explicitly set to null)
+_MISSING = object()
+
 class ConfigsValidationError(Exception):
     """
     Custom exception for configuration validation errors.
@@ -66,6 +75,18 @@ class ConfigsParsingError(Exception):
         super().__init__(message)
         self.message = message
 
+@validate_call
+def write_default_configs(configs_path: str):
+    """
+    Writes the default configurations to a new YAML file.
+    Args:
+        configs_path (str): The path of the configuration file to be created.
+    Raises:
+        FileExistsError: If the configuration file already exists.
+    """
+    with open(configs_path, "x") as f:
+        yaml.dump(DEFAULT_CONFIGS, f, Dumper=_Dumper)
+
 @validate_call
 def load_and_validate_configs(configs_path: str) -> dict:
     """
@@ -81,8 +102,8 @@ def load_and_validate_configs(configs_path: str) -> dict:
     """
     if not os.path.exists(configs_path): raise FileNotFoundError(f"Configuration file {configs_path} not found")
     try:
-        with open(configs_path, "r") as f:
-            configs = yaml.safe_load(f)
+        with open(configs_path, "rb") as f:
+            configs = yaml.load(f, Loader=_Loader)
     except Exception as e:
         raise ConfigsParsingError(f"Error parsing configuration file from YAML into a Python dictionary: {e}")
 
@@ -97,45 +118,41 @@ def load_and_validate_configs(configs_path: str) -> dict:
         raise ConfigsValidationError(f"'{field}': missing required field in configuration file")
 
     if not isinstance(queues_configs, list): raise ConfigsValidationError("'queues': must be a list")
-    if len(queues_configs) == 0:             raise ConfigsValidationError("'queues': no queues defined in the configuration file")
+    n_queues = len(queues_configs)
+    if n_queues == 0:                        raise ConfigsValidationError("'queues': no queues defined in the configuration file")
     for idx, qc in enumerate(queues_configs):
-        if not isinstance(qc, dict): raise ConfigsValidationError(f"'queues[{idx}]': must be a dictionary")
-        try:
-            qc["servers"]
-            qc["min_departure_time"]
-            qc["max_departure_time"]
-        except KeyError as e:
-            field = str(e).strip("'")
-            raise ConfigsValidationError(f"'queues[{idx}].{field}': missing required field in queue configuration")
+        if not isinstance(qc, dict):       raise ConfigsValidationError(f"'queues[{idx}]': must be a dictionary")
+        if "servers" not in qc:            raise ConfigsValidationError(f"'queues[{idx}].servers': missing required field in queue configuration")
+        if "min_departure_time" not in qc: raise ConfigsValidationError(f"'queues[{idx}].min_departure_time': missing required field in queue configuration")
+        if "max_departure_time" not in qc: raise ConfigsValidationError(f"'queues[{idx}].max_departure_time': missing required field in queue configuration")
         # initialize queues that don't receive clients from thee exterior 
         # with default values
-        if not "min_arrival_time" in qc: qc["min_arrival_time"] = 0.0
-        if not "max_arrival_time" in qc: qc["max_arrival_time"] = 0.0
-        if not "capacity"         in qc: qc["capacity"] = INFINITY
+        qc.setdefault("min_arrival_time", 0.0)
+        qc.setdefault("max_arrival_time", 0.0)
+        qc.setdefault("capacity", INFINITY)
         # (further validation on the individual queue fields can be done when instantiating the Queue objects)
     
     if not isinstance(network_configs, list): raise ConfigsValidationError("'network': must be a list")
-    from_to_probs: Dict[int, float] = {}
+    # total outgoing probability of each queue, indexed by the source queue ID
+    from_to_probs: List[float] = [0.0] * n_queues
     for idx, nc in enumerate(network_configs):
         if not isinstance(nc, dict): raise ConfigsValidationError(f"'network[{idx}]': must be a dictionary")
-        try:
-            source = nc["source"]
-            target = nc["target"]
-            probab = nc["probability"]
-        except KeyError as e:
-            field = str(e).strip("'")
-            raise ConfigsValidationError(f"'network[{idx}].{field}': missing required field in network configuration")
+        source = nc.get("source", _MISSING)
+        target = nc.get("target", _MISSING)
+        probab = nc.get("probability", _MISSING)
+        if source is _MISSING: raise ConfigsValidationError(f"'network[{idx}].source': missing required field in network configuration")
+        if target is _MISSING: raise ConfigsValidationError(f"'network[{idx}].target': missing required field in network configuration")
+        if probab is _MISSING: raise ConfigsValidationError(f"'network[{idx}].probability': missing required field in network configuration")
         if not isinstance(source, int):   raise ConfigsValidationError(f"'network[{idx}].source': must be an integer")
         if not isinstance(target, int):   raise ConfigsValidationError(f"'network[{idx}].target': must be an integer")
         if not isinstance(probab, float): raise ConfigsValidationError(f"'network[{idx}].probability': must be a float")
         if source < EXTERIOR:             raise ConfigsValidationError(f"'network[{idx}].source': must be a non-negative integer")
         if target < EXTERIOR:             raise ConfigsValidationError(f"'network[{idx}].target': must be a non-negative integer")
-        if source >= len(queues_configs): raise ConfigsValidationError(f"'network[{idx}].source': must be less than the number of queues defined")
-        if target >= len(queues_configs): raise ConfigsValidationError(f"'network[{idx}].target': must be less than the number of queues defined")
+        if source >= n_queues:            raise ConfigsValidationError(f"'network[{idx}].source': must be less than the number of queues defined")
+        if target >= n_queues:            raise ConfigsValidationError(f"'network[{idx}].target': must be less than the number of queues defined")
         if probab < 0.0 or probab > 1.0:  raise ConfigsValidationError(f"'network[{idx}].probability': probability must be between 0.0 and 1.0")
-        if source not in from_to_probs: from_to_probs[source] = 0.0
-        from_to_probs[source] += probab       
-    for _, probab in from_to_probs.items():
+        from_to_probs[source] += probab
+    for source, probab in enumerate(from_to_probs):
         if probab < 0.0 or probab > 1.0:
             # we don't enforce that it's exactly 1.0 because we assume the missing portion
             # is the probability of going to the exterior (the client leaves the system)
@@ -1,15 +1,33 @@
-from typing import Tuple, List, Dict
-from scheduler import Event, EventType
-from tabulate import tabulate
+from typing import Tuple, List
 from pydantic import validate_call
 from dataclasses import dataclass, field
-import heapq
-import copy
+from bisect import bisect_right
+from itertools import accumulate
 from rand.linearcongruent import RandomGenerator
-from collections import defaultdict
 from constants import EXTERIOR, INFINITY
 
-@dataclass(order=True)
+# headers of the queue length distribution table printed for each queue
+_TABLE_HEADERS: Tuple[str, str, str] = ("Queue Length", "Total Time", "Probability")
+
+def _format_table(headers: Tuple[str, ...], rows: List[List[str]]) -> str:
+    """
+    Formats rows of strings into a table with centered cells, using the same layout as
+        the 'pretty' format of the tabulate package.
+    Args:
+        headers (Tuple[str, ...]): The column headers.
+        rows (List[List[str]]): The rows of the table, each with one string per column.
+    Returns:
+        str: The formatted table, without a trailing newline.
+    """
+    widths    = [max([len(h)] + [len(r[col]) for r in rows]) for col, h in enumerate(headers)]
+    row_fmt   = "| " + " | ".join(f"{{:^{w}}}" for w in widths) + " |"
+    separator = "+" + "+".join("-" * (w + 2) for w in widths) + "+"
+    lines     = [separator, row_fmt.format(*headers), separator]
+    lines    += [row_fmt.format(*r) for r in rows]
+    lines.append(separator)
+    return "\n".join(lines)
+
+@dataclass(order=True, slots=True, frozen=True)
 class Connection:
     """
     Represents a connection to a queue to which clients can be forwarded.
@@ -27,13 +45,16 @@ class Queue:
     arrival and departure intervals, and an initial event.
     """
     
-    _instances_counter: int = 0
-    
+    __slots__ = ("ID", "CAPACITY", "SERVERS", "MIN_ARRIVAL_TIME", "MAX_ARRIVAL_TIME", "MIN_DEPARTURE_TIME",
+                 "MAX_DEPARTURE_TIME", "ARRIVAL_SPAN", "DEPARTURE_SPAN", "current_clients", "last_change", "states", "losses",
+                 "connections", "rnd", "_cum_probs", "_targets")
+
     @validate_call
-    def __init__(self, capacity: int, servers: int, arrival_interval: Tuple[float, float], departure_interval: Tuple[float, float]):
+    def __init__(self, queue_id: int, capacity: int, servers: int, arrival_interval: Tuple[float, float], departure_interval: Tuple[float, float]):
         """
         Initializes a Queue object with the specified parameters.
         Args:
+            queue_id (int): The ID of the queue, i.e., its index in the simulated network. Must be a non-negative integer.
             capacity (int): The maximum number of items the queue can hold. Must be a positive integer.
             servers (int): The number of servers available to process items in the queue. Must be a positive integer.
             arrival_interval (Tuple[float, float]): A tuple representing the minimum and maximum time between arrivals.
@@ -43,6 +64,7 @@ class Queue:
         Raises:
             ValueError: If any of the arguments have invalid values (e.g., non-positive integers, invalid intervals).
         """
+        if queue_id < 0:                                           raise ValueError("queue_id must be non-negative")
         if capacity <= 0:                                          raise ValueError("capacity must be positive")
         if servers <= 0:                                           raise ValueError("servers must be positive")
         if len(arrival_interval) != 2:                             raise ValueError("arrival_interval must have 2 elements")
@@ -52,8 +74,7 @@ class Queue:
         if arrival_interval[0] < 0 or arrival_interval[1] < 0:     raise ValueError("arrival_interval boundaries must be non-negative")
         if departure_interval[0] < 0 or departure_interval[1] < 0: raise ValueError("departure_interval boundaries must be non-negative")
         
-        self.ID: int = Queue._instances_counter
-        Queue._instances_counter += 1
+        self.ID: int = queue_id
 
         self.CAPACITY:           int               = capacity
         self.SERVERS:            int               = servers
@@ -61,11 +82,27 @@ class Queue:
         self.MAX_ARRIVAL_TIME:   float             = arrival_interval[1]
         self.MIN_DEPARTURE_TIME: float             = departure_interval[0]
         self.MAX_DEPARTURE_TIME: float             = departure_interval[1]
+        self.ARRIVAL_SPAN:       float             = self.MAX_ARRIVAL_TIME - self.MIN_ARRIVAL_TIME
+        self.DEPARTURE_SPAN:     float             = self.MAX_DEPARTURE_TIME - self.MIN_DEPARTURE_TIME
         self.current_clients:    int               = 0
-        self.states:             Dict[int, float]  = defaultdict(float)
+        # time spent at each queue length, which the simulator accumulates whenever the
+        # length changes (since last_change); it starts with a single slot and is grown by
+        # the simulator as new lengths are reached, so only the reached lengths are reported
+        self.last_change:        float             = 0.0
+        self.states:             List[float]       = [0.0]
         self.losses:             int               = 0
         self.connections:        List[Connection]  = []
-        self.rnd:                RandomGenerator   = RandomGenerator()
+        self.rnd:                RandomGenerator   = RandomGenerator(record_history=False)
+        self._cum_probs:         List[float]       = []
+        self._targets:           List[int]         = []
+
+    def finalize_connections(self):
+        """
+        Precomputes the cumulative connection probabilities used for routing clients.
+        Must be called after all connections have been appended to the queue.
+        """
+        self._cum_probs = list(accumulate(c.probability for c in self.connections))
+        self._targets   = [c.target_id for c in self.connections]
 
     def get_next_target(self) -> int:
         """
@@ -73,29 +110,19 @@ class Queue:
         Returns:
             int: The ID of the next target queue, or the EXTERIOR.
         """
-        r = self.rnd.next_normalized()
-        prob_acc = 0.0
-        for c in self.connections:
-            prob_acc += c.probability
-            if r < prob_acc:
-                return c.target_id
-        return EXTERIOR
+        targets = self._targets
+        i = bisect_right(self._cum_probs, self.rnd.next_normalized())
+        return targets[i] if i < len(targets) else EXTERIOR
 
-    @validate_call
     def print(self, global_time: float):
-        headers = ["Queue Length", "Total Time", "Probability"]
-        data = []
-        for i in range(len(self.states)):
-            state = f"{i}"
-            time  = f"{self.states[i]:.2f}"
-            prob  = f"{(self.states[i] / global_time)*100:.2f}%"
-            data.append([state, time, prob])
+        inv_pct = 100.0 / global_time
+        data = [[f"{i}", f"{t:.2f}", f"{t * inv_pct:.2f}%"] for i, t in enumerate(self.states)]
         results  = f"------------------ QUEUE {self.ID} ------------------\n"
         capacity = f"/{self.CAPACITY}" if self.CAPACITY != INFINITY else ""
         results += f"Configuration: G/G/{self.SERVERS}{capacity}\n"
         if self.MIN_ARRIVAL_TIME != 0 or self.MAX_ARRIVAL_TIME != 0:
             results += f"Arrivals:   [{self.MIN_ARRIVAL_TIME:6.2f}, {self.MAX_ARRIVAL_TIME:6.2f}]\n"
         results += f"Departures: [{self.MIN_DEPARTURE_TIME:6.2f}, {self.MAX_DEPARTURE_TIME:6.2f}]\n"
-        results += f"{tabulate(data, headers=headers, tablefmt='pretty')}\n"
+        results += f"{_format_table(_TABLE_HEADERS, data)}\n"
         results += f"TOTAL LOSSES: {self.losses}\n"
         print(results)
@@ -0,0 +1,37 @@
+import unittest
+from queue.queue import _format_table, _TABLE_HEADERS
+
+class TestFormatTable(unittest.TestCase):
+
+    def test_centered_cells(self):
+        """
+        Test cells are centered in their columns, with the extra space of odd paddings on the right.
+        """
+        rows = [["0", "12.50", "12.50%"], ["10", "3.25", "100.00%"]]
+        expected = "\n".join([
+            "+--------------+------------+-------------+",
+            "| Queue Length | Total Time | Probability |",
+            "+--------------+------------+-------------+",
+            "|      0       |   12.50    |   12.50%    |",
+            "|      10      |    3.25    |   100.00%   |",
+            "+--------------+------------+-------------+"
+        ])
+        self.assertEqual(_format_table(_TABLE_HEADERS, rows), expected)
+
+    def test_column_wider_than_header(self):
+        """
+        Test a column is widened to fit a cell longer than its header, which is then centered as well.
+        """
+        rows = [["0", "1234567890.00", "99.99%"], ["1", "0.01", "0.01%"]]
+        expected = "\n".join([
+            "+--------------+---------------+-------------+",
+            "| Queue Length |  Total Time   | Probability |",
+            "+--------------+---------------+-------------+",
+            "|      0       | 1234567890.00 |   99.99%    |",
+            "|      1       |     0.01      |    0.01%    |",
+            "+--------------+---------------+-------------+"
+        ])
+        self.assertEqual(_format_table(_TABLE_HEADERS, rows), expected)
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -1,4 +1,3 @@
-import matplotlib.pyplot as plt
 import time
 import argparse
 from typing import List, Union
@@ -10,11 +9,16 @@ class RandomGenerator:
     """
 
     # Counter for the number of generated random numbers
-    # This is a class variable, shared across all instances of the class.
-    count: int = 0
+    # This is a class variable, shared across all instances of the class. The count is kept
+    # inside a one-element list because rebinding a class attribute on every draw invalidates
+    # CPython's attribute caches for the whole class, slowing down every method call.
+    counter: List[int] = [0]
+
+    # Number of raw values generated at once by _refill().
+    batch_size: int = 4096
 
     @validate_call
-    def __init__(self, seed: Union[int, None] = None, M: int = 2**32, a: int = 1_664_525, c: int = 1_013_904_223):
+    def __init__(self, seed: Union[int, None] = None, M: int = 2**32, a: int = 1_664_525, c: int = 1_013_904_223, record_history: bool = True):
         """
         Constructor of the class. The default values for the M, a, and c parameters follow those
             recommended by Numerical Recipes. The seed, if left blank, will assume a time-based default seed.
@@ -23,6 +27,7 @@ class RandomGenerator:
             M (int): The modulus (M > 0).
             a (int): The multiplier.
             c (int): The increment.
+            record_history (bool): Whether to keep every generated number in the history (used for plotting).
         """
         if seed is None: seed = time.time_ns() % M
 
@@ -35,7 +40,27 @@ class RandomGenerator:
         self.a = a
         self.c = c
         self.M = M
+        self.record_history = record_history
+        self._counter = RandomGenerator.counter
         self.history: List[Union[int, float]] = [seed]
+        # pending raw values, stored in reverse order so they can be consumed with pop()
+        self._buffer: List[int] = []
+
+    def _refill(self) -> int:
+        """
+        Generates the next batch of raw values into the internal buffer, and takes the first one
+            out of it. After this call, the seed holds the last value of the batch.
+        Returns:
+            int: The first value of the new batch.
+        """
+        a, c, M, x = self.a, self.c, self.M, self.seed
+        buffer = [0] * self.batch_size
+        for i in range(self.batch_size - 1, -1, -1):
+            x = (a * x + c) % M
+            buffer[i] = x
+        self.seed = x
+        self._buffer = buffer
+        return buffer.pop()
     
     def next(self) -> int:
         """
@@ -43,10 +68,13 @@ class RandomGenerator:
         Returns:
             int: The next random number.
         """
-        self.seed = (self.a * self.seed + self.c) % self.M
-        self.history.append(self.seed)
-        RandomGenerator.count += 1
-        return self.seed
+        try:
+            generated: int = self._buffer.pop()
+        except IndexError:
+            generated = self._refill()
+        if self.record_history: self.history.append(generated)
+        self._counter[0] += 1
+        return generated
     
     def next_normalized(self) -> float:
         """
@@ -54,12 +82,18 @@ class RandomGenerator:
         Returns:
             float: The next random number in the range [0, 1).
         """
-        generated: int = self.next()
+        # the buffer is consumed inline rather than delegating to next(), as this is
+        # called once per simulated event; running out of values is the rare case, so
+        # it's handled as an exception rather than checked before every pop
+        try:
+            generated: int = self._buffer.pop()
+        except IndexError:
+            generated = self._refill()
         normalized: float = generated / self.M
-        self.history[-1] = normalized
+        if self.record_history: self.history.append(normalized)
+        self._counter[0] += 1
         return normalized
 
-    @validate_call
     def next_in_range(self, min: float, max: float) -> float:
         """
         Generates the next random number in the range [min, max).
@@ -69,15 +103,34 @@ class RandomGenerator:
         Returns:
             float: The next random number in the provided range.
         """
-        normalized: float = self.next_normalized()
-        ranged: float = min + ((max-min) * normalized)
-        self.history[-1] = ranged
-        return ranged
+        return self.next_scaled(min, max - min)
+    
+    def next_scaled(self, offset: float, span: float) -> float:
+        """
+        Generates the next random number in the range [offset, offset+span). Equivalent to
+            next_in_range(offset, offset+span), for callers that have the span precomputed.
+        Args:
+            offset (float): The lower bound of the range.
+            span (float): The width of the range.
+        Returns:
+            float: The next random number in the provided range.
+        """
+        try:
+            generated: int = self._buffer.pop()
+        except IndexError:
+            generated = self._refill()
+        scaled: float = offset + (span * (generated / self.M))
+        if self.record_history: self.history.append(scaled)
+        self._counter[0] += 1
+        return scaled
     
     def plot_all(self):
         """
         Plots all the pseud-random numbers generated by this class instance.
         """
+        # imported here rather than at module level, as pyplot takes hundreds of milliseconds to
+        # load and is only needed for plotting, not for the simulator that imports this module
+        import matplotlib.pyplot as plt
         plt.figure(figsize=(10,5))
         plt.plot(self.history, marker="o", linestyle="", markersize=3, label="Generated numbers")
         plt.xlabel("Iteration")
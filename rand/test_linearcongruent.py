@@ -0,0 +1,47 @@
+import unittest
+from rand.linearcongruent import RandomGenerator
+
+class TestRandomGenerator(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up a RandomGenerator instance with a fixed seed for testing.
+        """
+        self.seed = 12345
+        self.generator = RandomGenerator(seed=self.seed, record_history=False)
+
+    def test_sequence_across_refill(self):
+        """
+        Test the buffered values follow the plain LCG recurrence, across a batch boundary.
+        """
+        a, c, M = self.generator.a, self.generator.c, self.generator.M
+        expected = []
+        x = self.seed
+        for _ in range(RandomGenerator.batch_size + 2):
+            x = (a * x + c) % M
+            expected.append(x)
+        generated = [self.generator.next() for _ in range(RandomGenerator.batch_size + 2)]
+        self.assertEqual(generated, expected)
+
+    def test_counter_per_draw(self):
+        """
+        Test the shared counter advances once per drawn value, not once per refill.
+        """
+        start = RandomGenerator.counter[0]
+        draws = RandomGenerator.batch_size + 2
+        for _ in range(draws):
+            self.generator.next_normalized()
+        self.assertEqual(RandomGenerator.counter[0] - start, draws)
+
+    def test_in_range_matches_scaled(self):
+        """
+        Test next_in_range(lo, hi) and next_scaled(lo, hi - lo) return the same values for the same seed.
+        """
+        lo, hi = 1.5, 4.0
+        other = RandomGenerator(seed=self.seed, record_history=False)
+        in_range = [self.generator.next_in_range(lo, hi) for _ in range(100)]
+        scaled = [other.next_scaled(lo, hi - lo) for _ in range(100)]
+        self.assertEqual(in_range, scaled)
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -1,33 +1,21 @@
-from enum import Enum
-from dataclasses import dataclass, field
-from typing import List, Union
-import heapq
-from pydantic import validate_call
+from enum import IntEnum
+from itertools import count
+from typing import Iterator, List, Tuple, Union
+from heapq import heappush, heappop
 
-class EventType(Enum):
+class EventType(IntEnum):
     """
     EventType is an enumeration that represents the types of events that can occur
-    in a queue simulation.
+    in a queue simulation. Its members are plain integers, so they can be compared
+    and used as indices without going through the Enum machinery.
     """
     ARRIVAL   = 1
     DEPARTURE = 2
     PASSAGE   = 3
 
-@dataclass(order=True)
-class Event:
-    """
-    Represents an event in the simulation with a specific time and type.
-
-    Attributes:
-        time (float): The time at which the event occurs.
-        source(int): The queue from which the event originates.
-        target(int): The queue that is targeted by the event
-        type (EventType): The type of the event, represented as an instance of the EventType enumeration.
-    """
-    time: float
-    source: int = field(compare=False)
-    target: int = field(compare=False)
-    type: EventType = field(compare=False)
+# an event, as returned by Scheduler.get_next(): its time, the queue it originates from,
+# the queue it targets, and its type
+Event = Tuple[float, int, int, EventType]
 
 class Scheduler:
     """
@@ -37,22 +25,43 @@ class Scheduler:
         """
         Constructor of the class.
         """
-        self.events = []
+        # entries are (time, sequence, source, target, type) tuples, so the heap orders them
+        # with plain number comparisons, and events scheduled for the same time are retrieved
+        # in the order they were scheduled; the events are kept as plain fields rather than
+        # objects, as one is created for nearly every handled event
+        self.events: List[Tuple[float, int, int, int, EventType]] = []
+        self._sequence = count()
     
-    @validate_call
-    def schedule(self, event: Event):
+    def schedule(self, time: float, source: int, target: int, type: EventType):
         """
         Schedules a new event by adding it to the priority queue.
         Args:
-            event (Event): The event to be scheduled.
+            time (float): The time at which the event occurs.
+            source (int): The queue from which the event originates.
+            target (int): The queue that is targeted by the event.
+            type (EventType): The type of the event.
         """
-        heapq.heappush(self.events, event)
+        heappush(self.events, (time, next(self._sequence), source, target, type))
     
     def get_next(self) -> Union[Event, None]:
         """
         Retrieve and remove the next scheduled event from the priority queue.
         Returns:
-            Union[Event, None]: The next event in the priority queue based on its priority, or None if the queue is empty.
+            Union[Event, None]: The next event in the priority queue based on its time, as a
+                (time, source, target, type) tuple, or None if the queue is empty.
+        """
+        if not self.events: return None
+        time, _, source, target, type = heappop(self.events)
+        return time, source, target, type
+    
+    def __iter__(self) -> Iterator[Event]:
+        """
+        Retrieve and remove the scheduled events in order, until the priority queue is empty.
+            Events scheduled while iterating are also retrieved, in their order.
+        Returns:
+            Iterator[Event]: The events, as (time, source, target, type) tuples.
         """
-        if len(self.events) == 0: return None
-        return heapq.heappop(self.events)
\ No newline at end of file
+        events = self.events
+        while events:
+            time, _, source, target, type = heappop(events)
+            yield time, source, target, type
\ No newline at end of file
@@ -1,5 +1,6 @@
 import unittest
-from scheduler import Event, EventType, Scheduler
+from scheduler import EventType, Scheduler
+from constants import EXTERIOR
 
 class TestScheduler(unittest.TestCase):
 
@@ -13,30 +14,48 @@ class TestScheduler(unittest.TestCase):
         """
         Test scheduling an event.
         """
-        event = Event(time=1.0, type=EventType.ARRIVAL)
-        self.scheduler.schedule(event)
+        self.scheduler.schedule(1.0, EXTERIOR, 0, EventType.ARRIVAL)
         self.assertEqual(len(self.scheduler.events), 1)
-        self.assertEqual(self.scheduler.events[0], event)
-
-    def test_schedule_invalid_event(self):
-        """
-        Test scheduling an invalid event raises a TypeError.
-        """
-        with self.assertRaises(TypeError):
-            self.scheduler.schedule("not_an_event")
+        self.assertEqual(self.scheduler.get_next(), (1.0, EXTERIOR, 0, EventType.ARRIVAL))
 
     def test_get_next_event(self):
         """
         Test retrieving the next event from the scheduler.
         """
-        event1 = Event(time=1.0, type=EventType.ARRIVAL)
-        event2 = Event(time=0.5, type=EventType.DEPARTURE)
-        self.scheduler.schedule(event1)
-        self.scheduler.schedule(event2)
+        self.scheduler.schedule(1.0, EXTERIOR, 0, EventType.ARRIVAL)
+        self.scheduler.schedule(0.5, 0, EXTERIOR, EventType.DEPARTURE)
         next_event = self.scheduler.get_next()
-        self.assertEqual(next_event, event2)  # Event with the smallest time should be returned first
+        self.assertEqual(next_event, (0.5, 0, EXTERIOR, EventType.DEPARTURE))  # Event with the smallest time should be returned first
         self.assertEqual(len(self.scheduler.events), 1)
 
+    def test_get_next_event_same_time(self):
+        """
+        Test events scheduled for the same time are retrieved in the order they were scheduled.
+        """
+        events = [(1.0, i, EXTERIOR, EventType.DEPARTURE) for i in range(5)]
+        for event in events:
+            self.scheduler.schedule(*event)
+        for event in events:
+            self.assertEqual(self.scheduler.get_next(), event)
+
+    def test_iterate_events(self):
+        """
+        Test iterating over the scheduler retrieves the events in order, including those scheduled while iterating.
+        """
+        self.scheduler.schedule(2.0, EXTERIOR, 0, EventType.ARRIVAL)
+        self.scheduler.schedule(1.0, EXTERIOR, 0, EventType.ARRIVAL)
+        retrieved = []
+        for event in self.scheduler:
+            retrieved.append(event)
+            if len(retrieved) == 1:
+                self.scheduler.schedule(1.5, 0, EXTERIOR, EventType.DEPARTURE)
+        self.assertEqual(retrieved, [
+            (1.0, EXTERIOR, 0, EventType.ARRIVAL),
+            (1.5, 0, EXTERIOR, EventType.DEPARTURE),
+            (2.0, EXTERIOR, 0, EventType.ARRIVAL)
+        ])
+        self.assertEqual(len(self.scheduler.events), 0)
+
     def test_get_next_event_empty(self):
         """
         Test retrieving an event from an empty scheduler returns None.
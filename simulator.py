@@ -1,33 +1,44 @@
 from queue import Queue, Connection
 from constants import EXTERIOR
-from scheduler import Scheduler, Event, EventType
+from scheduler import Scheduler, EventType
 from rand.linearcongruent import RandomGenerator
 import argparse
-import yaml
-import os
 from pydantic import validate_call
 import logging
 import json
-from typing import List, Dict
-from configs import load_and_validate_configs, DEFAULT_CONFIGS, DEFAULT_CONFIGS_FILENAME
+from dataclasses import dataclass, field
+from typing import List, Dict, Callable
+from configs import load_and_validate_configs, write_default_configs, DEFAULT_CONFIGS_FILENAME
 
-queues: List[Queue] = []
+# event types bound once, as Enum member lookups are slow
+ARRIVAL, DEPARTURE, PASSAGE = EventType.ARRIVAL, EventType.DEPARTURE, EventType.PASSAGE
 
-rnd          = RandomGenerator()
-sched        = Scheduler()
-global_time  = 0.0
+@dataclass(slots=True)
+class SimulationContext:
+    """
+    Holds the state of a running simulation, which is passed to each event handler.
+
+    Attributes:
+        queues (List[Queue]): The queues of the simulated network, indexed by their IDs.
+        sched (Scheduler): The scheduler holding the pending events.
+        rnd (RandomGenerator): The generator used to draw arrival and service times.
+        time (float): The current simulation time, i.e., the time of the last handled event.
+    """
+    queues: List[Queue]     = field(default_factory=list)
+    sched:  Scheduler       = field(default_factory=Scheduler)
+    rnd:    RandomGenerator = field(default_factory=lambda: RandomGenerator(record_history=False))
+    time:   float           = 0.0
 
 def default_configs():
     """
     Creates a default configuration file if it does not already exist.
     """
-    if os.path.exists(DEFAULT_CONFIGS_FILENAME):
+    try:
+        write_default_configs(DEFAULT_CONFIGS_FILENAME)
+    except FileExistsError:
         logging.error(f"File {DEFAULT_CONFIGS_FILENAME} already exists. Not overwriting.")
         return
 
-    with open(DEFAULT_CONFIGS_FILENAME, "w") as f:
-        yaml.safe_dump(DEFAULT_CONFIGS, f)
-
     logging.info(f"Default configurations written to the {DEFAULT_CONFIGS_FILENAME} file.")
 
 @validate_call
@@ -39,12 +50,16 @@ def simulation(configs: dict):
     Args:
         configs (dict): The configuration dictionary containing queue and network settings.
     """
-    global queues, sched, global_time
-    
-    logging.debug(f"Simulating with configs:\n{json.dumps(configs, indent=4)}")
+    ctx = SimulationContext()
+    queues = ctx.queues
+
+    # the configs are only serialized when they will actually be logged
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.debug(f"Simulating with configs:\n{json.dumps(configs, indent=4)}")
 
-    for qc in configs["queues"]:
+    for queue_id, qc in enumerate(configs["queues"]):
         queues.append(Queue(
+            queue_id=queue_id,
             capacity=qc["capacity"],
             servers=qc["servers"],
             arrival_interval=(qc["min_arrival_time"], qc["max_arrival_time"]),
@@ -59,153 +74,165 @@ def simulation(configs: dict):
             target_id=target,
             probability=probab
         ))
+    for q in queues:
+        q.finalize_connections()
 
-    sched.schedule(Event(
+    ctx.sched.schedule(
         time=configs["init_arrival_time"],
         source=EXTERIOR,
         target=0,
-        type=EventType.ARRIVAL
-    ))
-    while RandomGenerator.count < configs["max_randoms"]:
-        current_event = sched.get_next()
-        if current_event is None:
-            logging.warning("Out of events! Finishing simulation...")
-            break
-        match current_event.type:
-            case EventType.ARRIVAL:   arrival(current_event)
-            case EventType.PASSAGE:   passage(current_event)
-            case EventType.DEPARTURE: departure(current_event)
+        type=ARRIVAL
+    )
+    # the draw counter is shared process-wide, so the budget starts from its current value
+    used_randoms = RandomGenerator.counter
+    max_randoms = used_randoms[0] + configs["max_randoms"]
+    for time, source, target, event_type in ctx.sched:
+        if used_randoms[0] >= max_randoms: break
+        HANDLERS[event_type](ctx, time, source, target)
+    else:
+        logging.warning("Out of events! Finishing simulation...")
     
+    # account for the time each queue has spent in its current state since its last change
+    global_time = ctx.time
+    for q in queues:
+        q.states[q.current_clients] += global_time - q.last_change
+        q.last_change = global_time
+
     print("\n======================== SIMULATION RESULTS ========================\n")
     print(f"TOTAL SIMULATION TIME: {global_time:.2f}\n")
     for q in queues:
         q.print(global_time)
 
-@validate_call
-def accumulate_time(event: Event):
-    """
-    Updates the global simulation time, as well as the queue states for all queues.
-    Args:
-        event (Event): The event object to accumulate time for.
-    """
-    global queues, global_time
-    for q in queues:
-        q.states[q.current_clients] += event.time - global_time
-    global_time = event.time
-
-@validate_call
-def departure(event: Event):
+def departure(ctx: SimulationContext, time: float, source: int, target: int):
     """
     Handles a departure event in the queue simulation.
     Args:
-        event (Event): The departure event to be handled. Must have an EventType of DEPARTURE.
-    Raises:
-        ValueError: If the provided event is not of type EventType.DEPARTURE.
+        ctx (SimulationContext): The state of the running simulation.
+        time (float): The time at which the client departs.
+        source (int): The ID of the queue the client departs from.
+        target (int): The target of the departure, i.e., the EXTERIOR.
     """
-    global queues, rnd, sched, global_time
-    if event.type != EventType.DEPARTURE: raise ValueError("event must be a departure event")
-
-    accumulate_time(event)
-    src = queues[event.source]
-    src.current_clients -= 1
+    sched, rnd = ctx.sched, ctx.rnd
+    global_time = ctx.time = time
+    src = ctx.queues[source]
+    clients = src.current_clients
+    src.states[clients] += global_time - src.last_change
+    src.last_change = global_time
+    src.current_clients = clients = clients - 1
 
-    if src.current_clients < src.SERVERS:
+    if clients < src.SERVERS:
         return # no one is waiting to be served
     
     # someone was waiting to be served, so we schedule their next action
     tgt_id = src.get_next_target()
-    sched.schedule(Event(
-        time=global_time + rnd.next_in_range(src.MIN_DEPARTURE_TIME, src.MAX_DEPARTURE_TIME),
-        source=src.ID,
-        target=tgt_id,
-        type=EventType.DEPARTURE if tgt_id == EXTERIOR else EventType.PASSAGE
-    ))
+    sched.schedule(
+        global_time + rnd.next_scaled(src.MIN_DEPARTURE_TIME, src.DEPARTURE_SPAN),
+        src.ID,
+        tgt_id,
+        DEPARTURE if tgt_id == EXTERIOR else PASSAGE
+    )
 
-@validate_call
-def arrival(event: Event):
+def arrival(ctx: SimulationContext, time: float, source: int, target: int):
     """
-    Handles the arrival of an event in the queue simulation.
+    Handles the arrival of a client from the exterior in the queue simulation.
     Args:
-        event (Event): The event object representing an arrival. Must have an EventType of ARRIVAL.
-    Raises:
-        ValueError: If the provided event is not of type ARRIVAL.
+        ctx (SimulationContext): The state of the running simulation.
+        time (float): The time at which the client arrives.
+        source (int): The origin of the arrival, i.e., the EXTERIOR.
+        target (int): The ID of the queue the client arrives at.
     """
-    global queues, sched, rnd, global_time
-    if event.type != EventType.ARRIVAL: raise ValueError("event must be an arrival event")
-    
-    accumulate_time(event)
-    tgt = queues[event.target]
+    sched, rnd = ctx.sched, ctx.rnd
+    global_time = ctx.time = time
+    tgt = ctx.queues[target]
 
     # schedule the next arrival to the system (so the simulation can continue)
-    sched.schedule(Event(
-        time=global_time + rnd.next_in_range(tgt.MIN_ARRIVAL_TIME, tgt.MAX_ARRIVAL_TIME),
-        source=EXTERIOR,
-        target=tgt.ID,
-        type=EventType.ARRIVAL
-    ))
+    sched.schedule(
+        global_time + rnd.next_scaled(tgt.MIN_ARRIVAL_TIME, tgt.ARRIVAL_SPAN),
+        EXTERIOR,
+        tgt.ID,
+        ARRIVAL
+    )
 
     # check if there is room for the new client of the current event in the target queue
-    if tgt.current_clients >= tgt.CAPACITY:
+    clients = tgt.current_clients
+    if clients >= tgt.CAPACITY:
         tgt.losses += 1
         return
-    tgt.current_clients += 1
+    states = tgt.states
+    states[clients] += global_time - tgt.last_change
+    tgt.last_change = global_time
+    tgt.current_clients = clients = clients + 1
+    if clients == len(states): states.append(0.0)
 
-    if tgt.current_clients > tgt.SERVERS:
+    if clients > tgt.SERVERS:
         return # client will need to wait for the next available server
 
     # client will be served immediately, so we schedule its next action
     next_tgt_id = tgt.get_next_target()
-    sched.schedule(Event(
-        time=global_time + rnd.next_in_range(tgt.MIN_DEPARTURE_TIME, tgt.MAX_DEPARTURE_TIME),
-        source=tgt.ID,
-        target=next_tgt_id,
-        type=EventType.DEPARTURE if next_tgt_id == EXTERIOR else EventType.PASSAGE
-    ))
+    sched.schedule(
+        global_time + rnd.next_scaled(tgt.MIN_DEPARTURE_TIME, tgt.DEPARTURE_SPAN),
+        tgt.ID,
+        next_tgt_id,
+        DEPARTURE if next_tgt_id == EXTERIOR else PASSAGE
+    )
 
-@validate_call
-def passage(event: Event):
+def passage(ctx: SimulationContext, time: float, source: int, target: int):
     """
     Handles a passage event in the queue simulation.
     Args:
-        event (Event): The passage event to be handled. Must have an EventType of PASSAGE.
-    Raises:
-        ValueError: If the provided event is not of type EventType.PASSAGE.
+        ctx (SimulationContext): The state of the running simulation.
+        time (float): The time at which the client passes between the queues.
+        source (int): The ID of the queue the client leaves.
+        target (int): The ID of the queue the client is forwarded to.
     """
-    global queues, sched, rnd, global_time
-    if event.type != EventType.PASSAGE: raise ValueError("event must be a passage event")
-
-    accumulate_time(event)
+    queues, sched, rnd = ctx.queues, ctx.sched, ctx.rnd
+    global_time = ctx.time = time
 
     # handle departure from source queue
-    src = queues[event.source]
-    src.current_clients -= 1
-    if src.current_clients >= src.SERVERS:
+    src = queues[source]
+    clients = src.current_clients
+    src.states[clients] += global_time - src.last_change
+    src.last_change = global_time
+    src.current_clients = clients = clients - 1
+    if clients >= src.SERVERS:
         # someone is waiting to be served in src, so we schedule their next action
         next_tgt_id = src.get_next_target()
-        sched.schedule(Event(
-            time=global_time + rnd.next_in_range(src.MIN_DEPARTURE_TIME, src.MAX_DEPARTURE_TIME),
-            source=src.ID,
-            target=next_tgt_id,
-            type=EventType.DEPARTURE if next_tgt_id == EXTERIOR else EventType.PASSAGE
-        ))
+        sched.schedule(
+            global_time + rnd.next_scaled(src.MIN_DEPARTURE_TIME, src.DEPARTURE_SPAN),
+            src.ID,
+            next_tgt_id,
+            DEPARTURE if next_tgt_id == EXTERIOR else PASSAGE
+        )
     
     # handle arrival to the target queue
-    tgt = queues[event.target]
-    if tgt.current_clients < tgt.CAPACITY:
+    tgt = queues[target]
+    clients = tgt.current_clients
+    if clients < tgt.CAPACITY:
         # the queue is not full, so we can add the client
-        tgt.current_clients += 1
-        if tgt.current_clients <= tgt.SERVERS:
+        states = tgt.states
+        states[clients] += global_time - tgt.last_change
+        tgt.last_change = global_time
+        tgt.current_clients = clients = clients + 1
+        if clients == len(states): states.append(0.0)
+        if clients <= tgt.SERVERS:
             # client will be served immediately, so we schedule its next action
             next_tgt_id = tgt.get_next_target()
-            sched.schedule(Event(
-                time=global_time + rnd.next_in_range(tgt.MIN_DEPARTURE_TIME, tgt.MAX_DEPARTURE_TIME),
-                source=tgt.ID,
-                target=next_tgt_id,
-                type=EventType.DEPARTURE if next_tgt_id == EXTERIOR else EventType.PASSAGE
-            ))
+            sched.schedule(
+                global_time + rnd.next_scaled(tgt.MIN_DEPARTURE_TIME, tgt.DEPARTURE_SPAN),
+                tgt.ID,
+                next_tgt_id,
+                DEPARTURE if next_tgt_id == EXTERIOR else PASSAGE
+            )
     else:
         tgt.losses += 1
 
+# event handlers indexed by the type of event they handle
+HANDLERS: Dict[EventType, Callable[[SimulationContext, float, int, int], None]] = {
+    ARRIVAL:   arrival,
+    PASSAGE:   passage,
+    DEPARTURE: departure
+}
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--generate-configs", "-g", action="store_true", help="Generate default configurations in the configs.yaml file")